@@ -1,7 +1,12 @@
+import functools
+import io
+import itertools
 import json
 import logging
+import operator
 import tomllib
 from pathlib import Path
+from typing import TextIO
 
 import click
 import yaml
@@ -15,8 +20,6 @@
 
 _logger = logging.getLogger(__name__)
 
-rendered = {"file"}
-
 
 @click.command()
 @click.option(
@@ -68,70 +71,80 @@ def main(
     output_file.parent.mkdir(parents=True, exist_ok=True)
     with output_file.open("w", encoding="utf-8") as f:
         f.write(
-            Template(templates["file"]["description"]).safe_render(
+            _compiled(templates["file"]["description"]).safe_render(
                 file=definitions["file"]
             )
         )
         f.write(
-            Template(templates["file"]["header"]).safe_render(
+            _compiled(templates["file"]["header"]).safe_render(
                 out_file=output_file
             )
         )
         try:
-            s = render_definitions(definitions, templates)
+            write_definitions(definitions, templates, f)
         except Exception:
             _logger.error(
                 "Failed to render code from file `%s`", input_definition
             )
             raise
-        f.write(s)
         f.write(
-            Template(templates["file"]["footer"]).safe_render(
+            _compiled(templates["file"]["footer"]).safe_render(
                 out_file=output_file
             )
         )
 
 
-def render_definitions(definitions, templates):
-    s = ""
-    element_names = set(definitions.keys())
+@functools.lru_cache(maxsize=4096)
+def _compiled(template: str) -> Template:
+    return Template(template)
 
-    group_names = {
-        k for k, v in definitions.items() if "group" == v.get("type")
-    }
-    for element_name in group_names:
-        s += render_definition(element_name, definitions, templates)
 
-    for element_name in element_names:
-        s += render_definition(element_name, definitions, templates)
-    return s
+def render_definitions(definitions, templates):
+    sink = io.StringIO()
+    write_definitions(definitions, templates, sink)
+    return sink.getvalue()
+
+
+def write_definitions(definitions, templates, sink: TextIO):
+    # Groups register their generated tag enum and union structure while
+    # rendering; keep those out of the caller's definitions
+    definitions = dict(definitions)
+    rendered = {"file"}
+    groups, others = [], []
+    for element_name, definition in definitions.items():
+        if "group" == definition.get("type"):
+            groups.append(element_name)
+        else:
+            others.append(element_name)
+
+    for element_name in itertools.chain(groups, others):
+        sink.write(
+            render_definition(element_name, definitions, templates, rendered)
+        )
 
 
-def render_definition(element_name, definitions, templates):
+def render_definition(element_name, definitions, templates, rendered):
     if element_name in rendered:
         return ""
-    rendered.add(element_name)
     definition = definitions[element_name]
-    s = ""
-    if "structure" == definition["type"]:
-        s += render_structure(element_name, definitions, templates)
-    if "enum" == definition["type"]:
-        s += render_enum(element_name, definitions, templates)
-    if "group" == definition["type"]:
-        s += render_group(element_name, definitions, templates)
-    if "bit_field" == definition["type"]:
-        s += render_bit_field(element_name, definitions, templates)
-
-    return s
+    definition_type = definition["type"]
+    if not (renderer := _renderers.get(definition_type)):
+        raise ValueError(
+            f"Unknown definition type: {definition_type!r} for {element_name}"
+        )
+    rendered.add(element_name)
+    return renderer(element_name, definitions, templates, rendered)
 
 
-def render_structure(structure_name, definitions, templates):
-    structure = definitions[structure_name]
+def render_structure(structure_name, definitions, templates, rendered):
+    structure = {**definitions[structure_name], "name": structure_name}
     assert structure["type"] == "structure"
-    structure["name"] = structure_name
     expected_size = structure["size"]
     measured_size = 0
-    s = ""
+    parts = []
+    # Members are rendered in the same pass that collects their dependencies,
+    # but emitted after the structure header
+    member_parts = []
 
     if members := structure.get("members"):
         for member in members:
@@ -145,114 +158,116 @@ def render_structure(structure_name, definitions, templates):
                 raise
             member_name = member["type"]
             if member_name in definitions:
-                s += render_definition(member_name, definitions, templates)
+                parts.append(
+                    render_definition(
+                        member_name, definitions, templates, rendered
+                    )
+                )
+            member_parts.append(render_structure_member(member, templates))
+    else:
+        member_parts.append(templates["structure"]["members"]["empty"])
 
-    s += Template(templates["structure"]["header"]).safe_render(
-        structure=structure
+    parts.append(
+        _compiled(templates["structure"]["header"]).safe_render(
+            structure=structure
+        )
     )
-    s += render_structure_members(structure_name, definitions, templates)
-    s += Template(templates["structure"]["footer"]).safe_render(
-        structure=structure
+    parts.extend(member_parts)
+    parts.append(
+        _compiled(templates["structure"]["footer"]).safe_render(
+            structure=structure
+        )
     )
 
     assert (
         expected_size == measured_size
     ), f"Structure `{structure_name}` size is {expected_size}, but member sizes total {measured_size}"
-    return s
-
-
-def render_structure_members(structure_name, definitions, templates):
-    structure = definitions.get(structure_name)
-
-    s = ""
-    assert structure["type"] == "structure"
-    if members := structure.get("members"):
-        for member in members:
-            s += render_structure_member(member, templates)
-    else:
-        s = templates["structure"]["members"]["empty"]
-    return s
+    return "".join(parts)
 
 
 def render_structure_member(member, templates):
     if "union" == member["type"]:
         return render_structure_union(member, templates)
-    if member_template := templates["structure"]["members"].get(member["type"]):
-        return Template(member_template).safe_render(member=member)
-    member_template = templates["structure"]["members"]["default"]
-    return Template(member_template).safe_render(member=member)
+    member_templates = templates["structure"]["members"]
+    member_template = (
+        member_templates.get(member["type"]) or member_templates["default"]
+    )
+    return _compiled(member_template).safe_render(member=member)
 
 
 def render_structure_union(union, templates):
-    s = ""
-    s += Template(
-        templates["structure"]["members"]["union"]["header"]
-    ).safe_render(union=union)
+    parts = [
+        _compiled(
+            templates["structure"]["members"]["union"]["header"]
+        ).safe_render(union=union)
+    ]
 
     for member in union["members"]:
-        s += render_structure_member(member, templates)
+        parts.append(render_structure_member(member, templates))
 
-    s += Template(
-        templates["structure"]["members"]["union"]["footer"]
-    ).safe_render(union=union)
-    return s
+    parts.append(
+        _compiled(
+            templates["structure"]["members"]["union"]["footer"]
+        ).safe_render(union=union)
+    )
+    return "".join(parts)
 
 
-def render_enum(element_name, definitions, templates):
-    enumeration = definitions[element_name]
+def render_enum(
+    element_name, definitions, templates, rendered
+):  # pylint: disable=unused-argument
+    enumeration = {**definitions[element_name], "name": element_name}
     assert enumeration["type"] == "enum"
-    enumeration["name"] = element_name
-    s = ""
+    parts = []
 
-    s += Template(templates["enum"]["header"]).safe_render(
-        enumeration=enumeration
+    parts.append(
+        _compiled(templates["enum"]["header"]).safe_render(
+            enumeration=enumeration
+        )
     )
-    s += render_enum_values(element_name, definitions, templates)
-    s += Template(templates["enum"]["footer"]).safe_render(
-        enumeration=enumeration
+    parts.append(render_enum_values(enumeration, templates))
+    parts.append(
+        _compiled(templates["enum"]["footer"]).safe_render(
+            enumeration=enumeration
+        )
     )
 
-    return s
+    return "".join(parts)
 
 
-def render_enum_values(element_name, definitions, templates):
-    enumeration = definitions[element_name]
-    enumeration["name"] = element_name
-    s = ""
+def render_enum_values(enumeration, templates):
     values = enumeration.get("values")
-    for value in values:
-        s += render_enum_value(value, enumeration, templates)
-    return s
+    return "".join(
+        render_enum_value(value, enumeration, templates) for value in values
+    )
 
 
 def render_enum_value(value_definition, enumeration, templates):
     if "value" in value_definition:
-        return Template(templates["enum"]["valued"]).safe_render(
+        return _compiled(templates["enum"]["valued"]).safe_render(
             enumeration=enumeration, value=value_definition
         )
     member_template = templates["enum"]["default"]
-    return Template(member_template).safe_render(
+    return _compiled(member_template).safe_render(
         enumeration=enumeration, value=value_definition
     )
 
 
-def render_group(group_name, definitions, templates):
-    group = definitions[group_name]
+def render_group(group_name, definitions, templates, rendered):
+    group = {**definitions[group_name], "name": group_name}
     assert group["type"] == "group"
 
-    group["name"] = group_name
-    s = ""
-
-    group_elements = {
-        k: v
-        for k, v in definitions.items()
-        if group_name in v.get("groups", {})
-    }
-    group_elements = dict(
-        sorted(
-            group_elements.items(),
-            key=lambda x: x[1]["groups"][group_name]["value"],
-        )
+    parts = []
+
+    # (tag value, tag label, element name, element), ordered by tag value
+    group_elements = sorted(
+        (
+            (membership["value"], membership["name"], k, v)
+            for k, v in definitions.items()
+            if (groups := v.get("groups")) is not None
+            and (membership := groups.get(group_name)) is not None
+        ),
+        key=operator.itemgetter(0),
     )
 
     if not group_elements:
@@ -264,32 +279,49 @@ def render_group(group_name, definitions, templates):
         _logger.error("Group `%s` is missing `size`", group_name)
         raise
 
+    type_name_template = _compiled(templates["structure"]["type_name"])
+    enum_values = []
+    union_members = []
+    for value, label, element_name, element in group_elements:
+        enum_values.append(
+            {
+                "label": label,
+                "value": value,
+                "display_name": element["description"],
+                "description": "@see "
+                + type_name_template.safe_render(
+                    structure={**element, "name": element_name}
+                ),
+            }
+        )
+        union_members.append(
+            {
+                "name": label,
+                "type": element_name,
+                "display_name": element["display_name"],
+                "description": element["description"],
+                "size": element["size"],
+            }
+        )
+
     group_enum = {
         "name": f'{group["name"]}_tag',
         "display_name": f'{group["name"]} tag',
         "description": f'Enumeration for {group["name"]} tag',
         "type": "enum",
         "size": enum_size,
+        "values": enum_values,
     }
-    group_enum["values"] = []
-    for element_name, element in group_elements.items():
-        element["name"] = element_name
-        enum_value = {
-            "label": element["groups"][group_name]["name"],
-            "value": element["groups"][group_name]["value"],
-            "display_name": element["description"],
-            "description": "@see "
-            + Template(templates["structure"]["type_name"]).safe_render(
-                structure=element
-            ),
-        }
-        group_enum["values"].append(enum_value)
 
     definitions[group_enum["name"]] = group_enum
-    s += render_definition(group_enum["name"], definitions, templates)
+    parts.append(
+        render_definition(group_enum["name"], definitions, templates, rendered)
+    )
 
-    for element_name in group_elements:
-        s += render_definition(element_name, definitions, templates)
+    for _, _, element_name, _ in group_elements:
+        parts.append(
+            render_definition(element_name, definitions, templates, rendered)
+        )
 
     group_struct = {
         "name": f'{group["name"]}',
@@ -310,99 +342,87 @@ def render_group(group_name, definitions, templates):
         "name": "value",
         "type": "union",
         "description": "",
-        "members": [],
+        "members": union_members,
+        "size": max(m["size"] for m in union_members),
     }
-    for element_name, element in group_elements.items():
-        element["name"] = element_name
-        union_member = {
-            "name": element["groups"][group_name]["name"],
-            "type": element_name,
-            "display_name": element["display_name"],
-            "description": element["description"],
-            "size": element["size"],
-        }
-        group_union["members"].append(union_member)
-    group_union["size"] = max(m["size"] for m in group_union["members"])
     group_struct["members"].append(group_union)
     size = group_enum["size"] + group_union["size"]
     group_struct["size"] = size
 
     definitions[group_struct["name"]] = group_struct
     rendered.remove(group_struct["name"])
-    s += render_definition(group_struct["name"], definitions, templates)
+    parts.append(
+        render_definition(
+            group_struct["name"], definitions, templates, rendered
+        )
+    )
 
-    return s
+    return "".join(parts)
 
 
-def render_bit_field(bit_field_name, definitions, templates):
-    bit_field = definitions[bit_field_name]
+def render_bit_field(bit_field_name, definitions, templates, rendered):
+    bit_field = {**definitions[bit_field_name], "name": bit_field_name}
     assert bit_field["type"] == "bit_field"
-    bit_field["name"] = bit_field_name
-    s = ""
+    parts = []
 
     members = bit_field["members"]
     for member in members:
         member_name = member["type"]
         if member_name in definitions:
-            s += render_definition(member_name, definitions, templates)
+            parts.append(
+                render_definition(member_name, definitions, templates, rendered)
+            )
 
-    s += Template(templates["bit_field"]["header"]).safe_render(
-        bit_field=bit_field
+    parts.append(
+        _compiled(templates["bit_field"]["header"]).safe_render(
+            bit_field=bit_field
+        )
     )
-    s += render_bit_field_members(bit_field_name, definitions, templates)
-    s += Template(templates["bit_field"]["footer"]).safe_render(
-        bit_field=bit_field
+    parts.append(render_bit_field_members(bit_field, templates))
+    parts.append(
+        _compiled(templates["bit_field"]["footer"]).safe_render(
+            bit_field=bit_field
+        )
     )
 
-    return s
-
+    return "".join(parts)
 
-def render_bit_field_members(bit_field_name, definitions, templates):
-    bit_field = definitions.get(bit_field_name)
 
-    s = ""
+def render_bit_field_members(bit_field, templates):
+    parts = []
     assert bit_field["type"] == "bit_field"
     members = bit_field["members"]
     bit_position = 0
     for member in members:
-        assert bit_position <= member["start"]
         member = complete_bit_field_member(member)
-        if member["start"] == bit_position:
-            s += render_bit_field_member(bit_field, member, templates)
-        else:
-            s += render_bit_field_reserve(
-                bit_position, bit_field, member, templates
+        start = member["start"]
+        assert bit_position <= start
+        if bit_position < start:
+            parts.append(
+                render_bit_field_reserve(
+                    bit_position, bit_field, member, templates
+                )
             )
-            s += render_bit_field_member(bit_field, member, templates)
+        parts.append(render_bit_field_member(bit_field, member, templates))
         bit_position = member["last"] + 1
-    return s
+    return "".join(parts)
 
 
 def complete_bit_field_member(bit_field_member):
+    bit_field_member = dict(bit_field_member)
     try:
         assert "start" in bit_field_member
-        assert 0 <= bit_field_member["start"]
-
-        if "last" not in bit_field_member and "bits" not in bit_field_member:
-            bit_field_member["bits"] = 1
-            bit_field_member["last"] = bit_field_member["start"]
-        if "last" not in bit_field_member:
-            bit_field_member["last"] = (
-                bit_field_member["start"] + bit_field_member["bits"] - 1
-            )
-        if "bits" not in bit_field_member:
-            bit_field_member["bits"] = (
-                bit_field_member["last"] - bit_field_member["start"] + 1
-            )
+        start = bit_field_member["start"]
+        assert 0 <= start
 
-        assert (
-            bit_field_member["last"]
-            == bit_field_member["start"] + bit_field_member["bits"] - 1
-        )
-        assert (
-            bit_field_member["bits"]
-            == bit_field_member["last"] - bit_field_member["start"] + 1
-        )
+        if "last" in bit_field_member:
+            last = bit_field_member["last"]
+            bits = bit_field_member.setdefault("bits", last - start + 1)
+        else:
+            bits = bit_field_member.setdefault("bits", 1)
+            last = bit_field_member["last"] = start + bits - 1
+
+        assert last == start + bits - 1
 
         return bit_field_member
     except:  # pragma: no cover
@@ -417,21 +437,28 @@ def render_bit_field_reserve(bit_position, bit_field, member, templates):
         "last": member["start"] - 1,
         "type": "reserved",
     }
-    complete_bit_field_member(reserved_member)
+    reserved_member = complete_bit_field_member(reserved_member)
     return render_bit_field_member(bit_field, reserved_member, templates)
 
 
 def render_bit_field_member(bit_field, member, templates):
-    if member_template := templates["bit_field"]["members"].get(member["type"]):
-        return Template(member_template).safe_render(
-            bit_field=bit_field, member=member
-        )
-    member_template = templates["bit_field"]["members"]["default"]
-    return Template(member_template).safe_render(
+    member_templates = templates["bit_field"]["members"]
+    member_template = (
+        member_templates.get(member["type"]) or member_templates["default"]
+    )
+    return _compiled(member_template).safe_render(
         bit_field=bit_field, member=member
     )
 
 
+_renderers = {
+    "structure": render_structure,
+    "enum": render_enum,
+    "group": render_group,
+    "bit_field": render_bit_field,
+}
+
+
 def load_markup_file(markup_file: Path):  # pragma: no cover
     extension = markup_file.suffix
     if ".toml" == extension:
@@ -1,3 +1,4 @@
+import itertools
 import logging
 import math
 from typing import Any
@@ -9,41 +10,32 @@
 
 def element_into_bytes(element, definitions, endianness="big", size=None):
     element_name = list(element.keys())[0]
-    b = b""
     if definition := definitions.get(element_name):
-        if "group" == definition["type"]:
-            b += group_into_bytes(element, definitions, endianness)
-        if "structure" == definition["type"]:
-            b += structure_into_bytes(element, definitions, endianness)
-        if "enum" == definition["type"]:
-            b += enum_into_bytes(element, definitions, endianness)
-        if "bit_field" == definition["type"]:
-            b += bit_field_into_bytes(element, definitions, endianness)
-    else:
-        b += primitive_to_bytes(element, endianness, size)
-
-    return b
+        if into_bytes := _into_bytes.get(definition["type"]):
+            return into_bytes(element, definitions, endianness)
+        return b""
+    return primitive_to_bytes(element, endianness, size)
 
 
 def group_into_bytes(element, definitions, endianness):
     group_name = list(element.keys())[0]
     group_member_name = list(element[group_name].keys())[0]
 
-    b = b""
-
     group_elements = {
         k: v
         for k, v in definitions.items()
-        if group_name in v.get("groups", {})
+        if (groups := v.get("groups")) is not None and group_name in groups
     }
     member_definition = group_elements[group_member_name]
     tag = member_definition["groups"][group_name]["value"]
-    b += tag.to_bytes(1)
+    parts = [tag.to_bytes(1)]
 
     for e_name, e_value in element[group_name].items():
-        b += element_into_bytes({e_name: e_value}, definitions, endianness)
+        parts.append(
+            element_into_bytes({e_name: e_value}, definitions, endianness)
+        )
 
-    return b
+    return b"".join(parts)
 
 
 def structure_into_bytes(element, definitions, endianness):
@@ -51,23 +43,24 @@ def structure_into_bytes(element, definitions, endianness):
     struct_members = list(element.values())[0]
     struct_definition = definitions[struct_name]
 
-    b = b""
+    parts = []
     for member_definition in struct_definition.get("members", []):
         member_name = member_definition["name"]
         member_value = struct_members[member_name]
         member_type = member_definition["type"]
         member_size = member_definition["size"]
         member = {member_type: member_value}
-        b += element_into_bytes(member, definitions, endianness, member_size)
+        parts.append(
+            element_into_bytes(member, definitions, endianness, member_size)
+        )
 
-    return b
+    return b"".join(parts)
 
 
 def enum_into_bytes(element, definitions, endianness):
     enum_name = list(element.keys())[0]
     enum_value = list(element.values())[0]
     enum_definition = definitions[enum_name]
-    b = b""
 
     counter = 0
     for value in enum_definition["values"]:
@@ -80,9 +73,10 @@ def enum_into_bytes(element, definitions, endianness):
                 signed=enum_definition.get("signed", False),
             )
             assert parse_enum(b, enum_name, definitions, endianness)
+            return b
         counter += 1
 
-    return b
+    return b""
 
 
 def bit_field_into_bytes(element, definitions, endianness):
@@ -90,19 +84,21 @@ def bit_field_into_bytes(element, definitions, endianness):
     bit_field_members = list(element.values())[0]
     bit_field_definition = definitions[bit_field_name]
 
+    member_size = bit_field_definition["size"]
     raw_value = 0
     for member_definition in bit_field_definition.get("members", []):
-        generate_structured_code.complete_bit_field_member(member_definition)
+        member_definition = generate_structured_code.complete_bit_field_member(
+            member_definition
+        )
         member_name = member_definition["name"]
         member_value = bit_field_members[member_name]
         member_type = member_definition["type"]
-        member_size = bit_field_definition["size"]
         member = {member_type: member_value}
         byte_value: bytes = element_into_bytes(
             member, definitions, endianness, member_size
         )
         v = int.from_bytes(byte_value, endianness)
-        mask = int("1" * member_definition["bits"], 2)
+        mask = (1 << member_definition["bits"]) - 1
         v = v & mask
         v = v << member_definition["start"]
 
@@ -112,6 +108,14 @@ def bit_field_into_bytes(element, definitions, endianness):
     return b
 
 
+_into_bytes = {
+    "group": group_into_bytes,
+    "structure": structure_into_bytes,
+    "enum": enum_into_bytes,
+    "bit_field": bit_field_into_bytes,
+}
+
+
 def primitive_to_bytes(element, endianness, size):
     type_name = list(element.keys())[0]
     value = list(element.values())[0]
@@ -139,21 +143,8 @@ def primitive_to_bytes(element, endianness, size):
 def parse_bytes(byte_data, type_name, definitions, endianness="big"):
     try:
         if definition := definitions.get(type_name):
-            definition_type = definition["type"]
-            if "structure" == definition_type:
-                return parse_struct(
-                    byte_data, type_name, definitions, endianness
-                )
-            if "enum" == definition_type:
-                return parse_enum(byte_data, type_name, definitions, endianness)
-            if "group" == definition_type:
-                return parse_group(
-                    byte_data, type_name, definitions, endianness
-                )
-            if "bit_field" == definition_type:
-                return parse_bit_field(
-                    byte_data, type_name, definitions, endianness
-                )
+            if parse := _parsers.get(definition["type"]):
+                return parse(byte_data, type_name, definitions, endianness)
         return parse_primitive(byte_data, type_name, endianness)
     except Exception as _e:  # pylint: disable=broad-exception-caught
         _logger.exception("e")
@@ -168,12 +159,13 @@ def parse_struct(byte_data, struct_name, definitions, endianness):
     ), f'Expected {definition["size"]} bytes for `{struct_name}`, found {len(byte_data)}'
 
     members = definition.get("members", [])
+    offsets = list(
+        itertools.accumulate((member["size"] for member in members), initial=0)
+    )
     parsed_members = {}
-    for member in members:
-        member_bytes = byte_data[: member["size"]]
-        byte_data = byte_data[member["size"] :]
+    for member, start, end in zip(members, offsets, offsets[1:]):
         parsed_members[member["name"]] = parse_bytes(
-            member_bytes, member["type"], definitions, endianness
+            byte_data[start:end], member["type"], definitions, endianness
         )
     return parsed_members
 
@@ -235,27 +227,37 @@ def parse_bit_field(
 
     parsed_members = {}
     for member in definition.get("members", []):
-        if member_definition := definitions.get(member["type"]):
+        member_type = member["type"]
+        if member_definition := definitions.get(member_type):
             is_signed = member_definition.get("signed", False)
         else:
-            is_signed = "int" == member["type"]
-        generate_structured_code.complete_bit_field_member(member)
-        mask = int("1" * member["bits"], 2)
+            is_signed = "int" == member_type
+        member = generate_structured_code.complete_bit_field_member(member)
+        bits = member["bits"]
+        mask = (1 << bits) - 1
         bits_value = byte_value >> member["start"]
         bits_value: int = bits_value & mask
         if is_signed:
-            msb = int("1" + "0" * (member["bits"] - 1), 2)
+            msb = 1 << (bits - 1)
             is_negative = bits_value & msb
             if is_negative:
                 bits_value = bits_value | (~mask)
-        size = math.ceil(member["bits"] / 8.0)
+        size = math.ceil(bits / 8.0)
         masked_bytes = bits_value.to_bytes(length=size, signed=is_signed)
         parsed_members[member["name"]] = parse_bytes(
-            masked_bytes, member["type"], definitions, endianness
+            masked_bytes, member_type, definitions, endianness
         )
     return parsed_members
 
 
+_parsers = {
+    "structure": parse_struct,
+    "enum": parse_enum,
+    "group": parse_group,
+    "bit_field": parse_bit_field,
+}
+
+
 def parse_primitive(byte_data: bytes, type_name: str, endianness: str):
     if "int" == type_name:
         return int.from_bytes(byte_data, endianness, signed=True)
@@ -1,12 +1,14 @@
 import collections
-import copy
+import functools
 import logging
+import operator
 import re
 from collections import namedtuple
 from typing import Any
 
 _logger = logging.getLogger(__name__)
 _sentinel_dict = {}
+_simple_expression = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*")
 
 
 # pylint: disable=dangerous-default-value
@@ -14,12 +16,15 @@
 # the __mapping variable was not passed.
 class Template:
     patter_str = r"\$(?:(?P<escaped>\$)|{(?P<braced>.+?)}|(?P<invalid>))"
+    pattern: re.Pattern = re.compile(patter_str, re.VERBOSE)
 
     def __init__(self, template):
-        self.pattern: re.Pattern = re.compile(self.patter_str, re.VERBOSE)
         self.template = template
 
     def render(self, __mapping=_sentinel_dict, /, **kwds) -> str:
+        if "$" not in self.template:
+            # Nothing to substitute, skip building the mapping
+            return self.template
         # Using the fact that a default dict is a fixed object to detect if an
         # unnamed mapping dictioanry was passed in.
         mapping = self._mapping(__mapping, **kwds)
@@ -33,6 +38,8 @@ def convert(match_object):
             if expression := match_object.group("braced"):
                 f_string = rf'f"{{mapping.{expression}}}"'
                 try:
+                    if _simple_expression.fullmatch(expression):
+                        return _lookup(mapping, expression)
                     return eval(f_string)  # pylint: disable=eval-used
                 except Exception:
                     _logger.error("Failed to evaluate %s", f_string)
@@ -50,6 +57,9 @@ def convert(match_object):
         return result
 
     def safe_render(self, __mapping=_sentinel_dict, /, **kwds) -> str:
+        if "$" not in self.template:
+            # Nothing to substitute, skip building the mapping
+            return self.template
         # Using the fact that a default dict is a fixed object to detect if an
         # unnamed mapping dictioanry was passed in.
         mapping = self._mapping(__mapping, **kwds)
@@ -63,6 +73,8 @@ def convert(match_object):
             if expression := match_object.group("braced"):
                 f_string = rf'f"{{mapping.{expression}}}"'
                 try:
+                    if _simple_expression.fullmatch(expression):
+                        return _lookup(mapping, expression)
                     return eval(f_string)  # pylint: disable=eval-used
                 except Exception:  # pylint: disable=broad-exception-caught
                     return match_object.group()
@@ -89,17 +101,35 @@ def _mapping(self, __mapping=_sentinel_dict, /, **kwds) -> dict[str, Any]:
         return mapping
 
 
+def _lookup(mapping, expression: str) -> str:
+    # Plain dotted names (e.g. `member.name`) don't need the f-string
+    # machinery, so resolve them directly rather than compiling with eval
+    return format(operator.attrgetter(expression)(mapping))
+
+
 def named_tuple_from_dict(name: str, dictionary: dict[str, Any]):
     assert isinstance(dictionary, collections.abc.MutableMapping)
-    dictionary = copy.deepcopy(dictionary)
+    # Build the converted fields in a new dict rather than deep copying the
+    # input; only nested mappings need replacing
+    fields = {
+        k: (
+            named_tuple_from_dict(k, v)
+            if isinstance(v, collections.abc.MutableMapping)
+            else v
+        )
+        for k, v in dictionary.items()
+    }
+
+    new_tuple = _named_tuple_type(name, tuple(fields))
+    tuple_obj = new_tuple(**fields)
+    return tuple_obj
 
-    for k, v in dictionary.items():
-        if isinstance(v, collections.abc.MutableMapping):
-            dictionary[k] = named_tuple_from_dict(k, v)
 
-    new_tuple = namedtuple(name, dictionary)
-    tuple_obj = new_tuple(**dictionary)
-    return tuple_obj
+@functools.lru_cache(maxsize=1024)
+def _named_tuple_type(name: str, field_names: tuple[str, ...]):
+    # Creating a namedtuple class is far more expensive than instantiating
+    # one, and the same shapes are rendered over and over
+    return namedtuple(name, field_names)
 
 
 def merge(a, b):  # pragma: no cover
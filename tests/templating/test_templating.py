@@ -108,3 +108,15 @@ def test_we_can_recursevily_resolve_templates():
     result = t.render(person=person, templates=templates)
     expected = "Hello, Mr. Dickens, Charles"
     assert expected == result
+
+
+def test_template_without_placeholders_is_returned_as_is():
+    t = Template("union {\n")
+    assert "union {\n" == t.render(union={"name": "value"})
+    assert "union {\n" == t.safe_render(union={"name": "value"})
+
+
+def test_template_handles_differently_shaped_arguments_with_the_same_name():
+    t = Template("${person.name}")
+    assert "Bob" == t.render(person={"name": "Bob"})
+    assert "Al" == t.render(person={"age": 3, "name": "Al"})
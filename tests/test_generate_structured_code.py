@@ -1,3 +1,8 @@
+import copy
+import io
+
+import pytest
+
 from struct_writer import default_template, generate_structured_code
 
 
@@ -343,3 +348,144 @@ def test_render_bit_field_with_enum():
 
 """
     assert expected == result
+
+
+def test_render_unknown_type_raises():
+    definitions = {
+        "MY_thing": {
+            "type": "not_a_type",
+            "display_name": "My thing",
+            "description": "A thing",
+        },
+    }
+    template = default_template.default_template()
+    with pytest.raises(ValueError, match="not_a_type"):
+        generate_structured_code.render_definitions(definitions, template)
+
+
+def test_render_does_not_modify_definitions():
+    definitions = {
+        "MY_unmodified_group": {
+            "type": "group",
+            "display_name": "My group",
+            "description": "A group",
+            "size": 1,
+        },
+        "MY_unmodified_struct": {
+            "type": "structure",
+            "display_name": "My struct",
+            "description": "A struct",
+            "size": 0,
+            "groups": {
+                "MY_unmodified_group": {"value": 0, "name": "grouped_struct"},
+            },
+        },
+        "MY_unmodified_enum": {
+            "type": "enum",
+            "display_name": "My enum",
+            "description": "An enum",
+            "size": 1,
+            "values": [{"label": "first_value", "description": "First"}],
+        },
+    }
+    original = copy.deepcopy(definitions)
+    template = default_template.default_template()
+    generate_structured_code.render_definitions(definitions, template)
+    assert original == definitions
+
+
+def test_bit_field_member_templates_see_bit_field_name():
+    definitions = {
+        "MY_named_field": {
+            "type": "bit_field",
+            "display_name": "My field",
+            "description": "A bit field",
+            "size": 1,
+            "members": [
+                {
+                    "name": "foo",
+                    "start": 1,
+                    "type": "uint",
+                    "description": "foo",
+                },
+            ],
+        },
+    }
+    template = default_template.default_template()
+    template["bit_field"]["members"]["reserved"] = "${bit_field.name}_rsvd;\n"
+    template["bit_field"]["members"][
+        "uint"
+    ] = "${bit_field.name}_${member.name};\n"
+    result = generate_structured_code.render_definitions(definitions, template)
+    assert "MY_named_field_rsvd;\nMY_named_field_foo;\n" in result
+
+
+def test_render_definitions_can_be_called_repeatedly():
+    definitions = {
+        "MY_repeated_group": {
+            "type": "group",
+            "display_name": "My group",
+            "description": "A group",
+            "size": 1,
+        },
+        "MY_repeated_struct": {
+            "type": "structure",
+            "display_name": "My struct",
+            "description": "A struct",
+            "size": 0,
+            "groups": {
+                "MY_repeated_group": {"value": 0, "name": "grouped_struct"},
+            },
+        },
+    }
+    template = default_template.default_template()
+    first = generate_structured_code.render_definitions(definitions, template)
+    second = generate_structured_code.render_definitions(definitions, template)
+    assert first
+    assert first == second
+
+
+def test_write_definitions_matches_render_definitions():
+    definitions = {
+        "MY_streamed_struct": {
+            "type": "structure",
+            "display_name": "My struct",
+            "description": "A struct",
+            "size": 0,
+        },
+    }
+    template = default_template.default_template()
+    sink = io.StringIO()
+    generate_structured_code.write_definitions(definitions, template, sink)
+    result = generate_structured_code.render_definitions(definitions, template)
+    assert result
+    assert sink.getvalue() == result
+
+
+def test_complete_bit_field_member_returns_completed_copy():
+    member = {"name": "foo", "start": 2, "type": "uint"}
+    result = generate_structured_code.complete_bit_field_member(member)
+    assert {"name": "foo", "start": 2, "type": "uint"} == member
+    assert 1 == result["bits"]
+    assert 2 == result["last"]
+
+
+@pytest.mark.parametrize(
+    "member, bits, last",
+    [
+        ({"start": 3}, 1, 3),
+        ({"start": 3, "bits": 4}, 4, 6),
+        ({"start": 3, "last": 5}, 3, 5),
+        ({"start": 3, "bits": 3, "last": 5}, 3, 5),
+    ],
+)
+def test_complete_bit_field_member(member, bits, last):
+    result = generate_structured_code.complete_bit_field_member(member)
+    assert bits == result["bits"]
+    assert last == result["last"]
+
+
+def test_complete_bit_field_member_rejects_inconsistent_range():
+    member = {"start": 3, "bits": 2, "last": 5}
+    with pytest.raises(AssertionError):
+        generate_structured_code.complete_bit_field_member(member)